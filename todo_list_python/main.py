@@ -1,16 +1,32 @@
-from fastapi import Depends, FastAPI, HTTPException, Query, status
+from fastapi import Depends, FastAPI, HTTPException, Query, Response, status
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from pydantic import BaseModel, Field, field_validator
+from dataclasses import dataclass
+from operator import attrgetter
 from typing import Annotated, List, Optional
-import json
+import asyncio
+import hashlib
+import orjson
+import os
 import secrets
+import threading
 from pathlib import Path
 
-app = FastAPI(title="ToDoList EBAC", version="1.0.0")
+app = FastAPI(title="ToDoList EBAC", version="1.0.0", default_response_class=ORJSONResponse)
 
 DATA_FILE = Path(__file__).parent / "data.json"
 TASK_NOT_FOUND_MSG = "Tarefa não encontrada."
 
+# Conjuntos de validação construídos uma única vez, fora dos endpoints
+_VALID_ORDER_FIELDS = frozenset({"id", "title", "description", "done"})
+_SORTED_ORDER_FIELDS = ", ".join(sorted(_VALID_ORDER_FIELDS))
+# attrgetter é executado em C; instâncias prontas por campo evitam
+# construir um lambda + getattr por comparação na ordenação
+_ATTRGETTERS = {field: attrgetter(field) for field in _VALID_ORDER_FIELDS}
+_VALID_STATUS = frozenset({"completed", "pending"})
+_VALID_ORDER_DIRECTIONS = frozenset({"asc", "desc"})
+
 security = HTTPBasic()
 
 # Credenciais fixas
@@ -19,11 +35,19 @@ USERS = {
     "user": "user123"
 }
 
+# Digests SHA-256 pré-calculados: a comparação sempre acontece entre
+# valores de tamanho fixo, mesmo para usuário inexistente, fechando o
+# canal lateral de timing do atalho "username not in USERS"
+_USERS_H = {u: hashlib.sha256(p.encode()).digest() for u, p in USERS.items()}
+_ZERO_DIGEST = bytes(32)
+
 def verify_credentials(credentials: Annotated[HTTPBasicCredentials, Depends(security)]):
     username = credentials.username
     password = credentials.password
-    
-    if username not in USERS or not secrets.compare_digest(password, USERS[username]):
+
+    expected = _USERS_H.get(username, _ZERO_DIGEST)
+    given = hashlib.sha256(password.encode()).digest()
+    if not (secrets.compare_digest(given, expected) and username in _USERS_H):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Credenciais inválidas",
@@ -31,44 +55,61 @@ def verify_credentials(credentials: Annotated[HTTPBasicCredentials, Depends(secu
         )
     return username
 
-if not DATA_FILE.exists():
-    DATA_FILE.write_text("[]")
-    
-class TodoItem(BaseModel):
-    id: int = Field(..., description="ID único da tarefa", gt=0)
-    title: str = Field(..., description="Título da tarefa", min_length=1, max_length=100)
-    description: str = Field(..., description="Descrição da tarefa", min_length=1, max_length=500)
-    done: bool = Field(default=False, description="Status de conclusão da tarefa")
-    
-    @field_validator('title', 'description')
-    @classmethod
-    def validate_not_empty_string(cls, v: str) -> str:
-        if not v or v.strip() == "":
-            raise ValueError('Campo não pode estar vazio')
-        return v.strip()
-    
+# Memoização da leitura do disco: se (mtime_ns, tamanho) não mudou desde
+# o último parse, o arquivo é idêntico e o resultado anterior é reusado
+_file_cache: dict = {"stat": None, "todos": []}
+
+
+@dataclass(slots=True)
+class TodoRow:
+    """Representação em memória de uma tarefa.
+
+    Dataclass com slots em vez de BaseModel: ocupa uma fração da memória
+    por objeto e dispensa validação — os dados só entram aqui depois de
+    validados na borda HTTP (TodoCreate) ou lidos do disco já validados.
+    """
+    id: int
+    title: str
+    description: str
+    done: bool = False
+
     @classmethod
-    def load_all(cls) -> List['TodoItem']:
+    def load_all(cls) -> List['TodoRow']:
         """Carrega todas as tarefas do arquivo JSON"""
         try:
-            with open(DATA_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return [cls(**item) for item in data]
-        except (FileNotFoundError, json.JSONDecodeError):
+            st = DATA_FILE.stat()
+            stat_key = (st.st_mtime_ns, st.st_size)
+            if stat_key == _file_cache["stat"]:
+                return list(_file_cache["todos"])
+            # Leitura binária: orjson decodifica os bytes UTF-8 direto,
+            # sem passar pelo codec de texto do open()
+            data = orjson.loads(DATA_FILE.read_bytes())
+            todos = [cls(**item) for item in data]
+            _file_cache["stat"] = stat_key
+            _file_cache["todos"] = todos
+            return list(todos)
+        except (FileNotFoundError, orjson.JSONDecodeError):
             return []
-    
+
     @classmethod
-    def save_all(cls, todos: List['TodoItem']) -> None:
+    def save_all(cls, todos: List['TodoRow']) -> None:
         """Salva todas as tarefas no arquivo JSON"""
-        data = [todo.model_dump() for todo in todos]
-        with open(DATA_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-    
-    @classmethod
-    def get_next_id(cls) -> int:
-        """Obtém o próximo ID disponível"""
-        todos = cls.load_all()
-        return max((todo.id for todo in todos), default=0) + 1
+        # orjson serializa dataclasses nativamente, sem dict intermediário
+        blob = orjson.dumps(todos, option=orjson.OPT_INDENT_2)
+        # Grava em arquivo temporário e troca atomicamente, evitando
+        # data.json truncado caso o processo morra no meio da escrita
+        tmp_file = DATA_FILE.with_suffix(".json.tmp")
+        with open(tmp_file, "wb") as f:
+            f.write(blob)
+        os.replace(tmp_file, DATA_FILE)
+
+
+class TodoItem(BaseModel):
+    """Schema de resposta da API (a tarefa em si vive como TodoRow)"""
+    id: int = Field(..., description="ID único da tarefa", gt=0)
+    title: str = Field(..., description="Título da tarefa", min_length=1, max_length=100)
+    description: str = Field(..., description="Descrição da tarefa", min_length=1, max_length=500)
+    done: bool = Field(default=False, description="Status de conclusão da tarefa")
 
 class TodoCreate(BaseModel):
     title: str = Field(..., description="Título da tarefa", min_length=1, max_length=100)
@@ -82,18 +123,108 @@ class TodoCreate(BaseModel):
             raise ValueError('Campo não pode estar vazio')
         return v.strip()
 
-def read_data() -> List[TodoItem]:
-    """Lê os dados e retorna uma lista de TodoItem"""
-    return TodoItem.load_all()
-
-
-def write_data(todos: List[TodoItem]) -> None:
-    """Escreve os dados no arquivo"""
-    TodoItem.save_all(todos)
+# Cache em memória das tarefas: carregado uma única vez no startup,
+# evitando reler e revalidar o data.json a cada requisição
+_TODOS: List[TodoRow] = []
+# Índice id -> posição na lista, para buscas O(1) em vez de varredura linear
+_ID_INDEX: dict[int, int] = {}
+# Conjuntos de ids por status, para filtrar sem varrer a lista inteira
+_done_ids: set[int] = set()
+_pending_ids: set[int] = set()
+# Próximo id disponível: recalculado no load, incrementado a cada criação
+_next_id = 1
+# Visões ordenadas por (campo, direção), construídas sob demanda e
+# invalidadas a cada mutação — escritas são raras em relação às leituras
+_sorted_cache: dict[tuple[str, str], List[TodoRow]] = {}
+# Corpos de resposta de list_todos já serializados, por combinação de
+# parâmetros de consulta; no hit a resposta é só bytes + cabeçalhos HTTP
+_list_cache: dict[tuple, bytes] = {}
+_LOCK = threading.Lock()
+
+# Gravação em disco adiada: as mutações só marcam o cache como "sujo"
+# e um flusher em background agrupa várias escritas em um único flush
+FLUSH_INTERVAL = 0.1  # segundos
+_dirty = False
+_flusher_task: Optional[asyncio.Task] = None
+
+
+def _rebuild_index() -> None:
+    """Reconstrói o índice id -> posição e os conjuntos por status"""
+    _ID_INDEX.clear()
+    _done_ids.clear()
+    _pending_ids.clear()
+    for i, todo in enumerate(_TODOS):
+        _ID_INDEX[todo.id] = i
+        (_done_ids if todo.done else _pending_ids).add(todo.id)
+
+
+def _flush() -> None:
+    """Persiste o cache no disco se houver alterações pendentes"""
+    global _dirty
+    with _LOCK:
+        if not _dirty:
+            return
+        TodoRow.save_all(_TODOS)
+        _dirty = False
+
+
+async def _flusher() -> None:
+    """Tarefa em background que grava o cache em intervalos regulares"""
+    while True:
+        await asyncio.sleep(FLUSH_INTERVAL)
+        # to_thread: o event loop continua atendendo requisições
+        # enquanto o disco grava
+        await asyncio.to_thread(_flush)
+
+
+@app.on_event("startup")
+def load_todos() -> None:
+    """Carrega as tarefas do disco para o cache em memória"""
+    global _TODOS, _next_id, _flusher_task
+    # Criado aqui (uma vez por processo) e não no import do módulo
+    if not DATA_FILE.exists():
+        DATA_FILE.write_text("[]")
+    with _LOCK:
+        _TODOS = TodoRow.load_all()
+        _rebuild_index()
+        _sorted_cache.clear()
+        _list_cache.clear()
+        _next_id = max((todo.id for todo in _TODOS), default=0) + 1
+    _flusher_task = asyncio.get_running_loop().create_task(_flusher())
+
+
+@app.on_event("shutdown")
+def stop_flusher() -> None:
+    """Cancela o flusher e força uma última gravação no disco"""
+    if _flusher_task is not None:
+        _flusher_task.cancel()
+    _flush()
+
+
+def read_data() -> List[TodoRow]:
+    """Retorna a lista de tarefas do cache em memória"""
+    return _TODOS
+
+
+def _mark_dirty() -> None:
+    """Invalida as visões derivadas e agenda a gravação no disco"""
+    global _dirty
+    _sorted_cache.clear()
+    _list_cache.clear()
+    _dirty = True
+
+
+def write_data(todos: List[TodoRow]) -> None:
+    """Atualiza o cache em memória e marca para gravação no disco"""
+    global _TODOS
+    with _LOCK:
+        _TODOS = todos
+        _rebuild_index()
+        _mark_dirty()
 
 
 @app.get("/todos")
-def list_todos(
+async def list_todos(
     username: Annotated[str, Depends(verify_credentials)],
     page: int = Query(default=1, ge=1, description="Número da página"),
     size: int = Query(default=10, ge=1, le=100, description="Quantidade de itens por página"),
@@ -102,139 +233,173 @@ def list_todos(
    
 ):
     """Lista todas as tarefas com paginação (requer autenticação)"""
+    # Valida os parâmetros antes de tocar nos dados: requisição inválida
+    # não paga o custo de leitura/ordenação
+    if order_by and order_by not in _VALID_ORDER_FIELDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Campo '{order_by}' inválido. Use: {_SORTED_ORDER_FIELDS}"
+        )
+    if order_direction not in _VALID_ORDER_DIRECTIONS:
+        raise HTTPException(
+            status_code=400,
+            detail="order_direction deve ser 'asc' ou 'desc'"
+        )
+
+    # Resposta já serializada para esta combinação de parâmetros:
+    # no hit não há ordenação nem serialização, só bytes prontos
+    cache_key = (page, size, order_by, order_direction)
+    cached = _list_cache.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
     todos = read_data()
+    total = len(todos)
+
+    # Calcula os índices de início e fim da página
+    start_index = (page - 1) * size
+    end_index = start_index + size
 
-    # Validação e ordenação dos itens
+    # Ordenação dos itens
     if order_by:
-        valid_fields = {"id", "title", "description", "done"}
-        if order_by not in valid_fields:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Campo '{order_by}' inválido. Use: {', '.join(sorted(valid_fields))}"
-            )
         try:
             reverse = order_direction == "desc"
-            todos.sort(key=lambda x: getattr(x, order_by), reverse=reverse)
+            # Reusa a visão ordenada construída na primeira leitura após
+            # uma mutação; as páginas seguintes só fatiam a visão pronta
+            view_key = (order_by, order_direction)
+            view = _sorted_cache.get(view_key)
+            if view is None:
+                view = sorted(todos, key=_ATTRGETTERS[order_by], reverse=reverse)
+                _sorted_cache[view_key] = view
+            todos = view
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Erro ao ordenar por {order_by}: {str(e)}")
 
-    total = len(todos)
-    
-    # Calcula os índices de início e fim da página
-    start_index = (page - 1) * size
-    end_index = start_index + size
-    
     # Obtém os itens da página atual
     paginated_todos = todos[start_index:end_index]
 
-    
-    return {
+    # orjson serializa as dataclasses da página direto para bytes
+    body = orjson.dumps({
         "page": page,
         "size": size,
         "total": total,
         "total_pages": (total + size - 1) // size, # Cálculo do total de páginas
         "items": paginated_todos
-    }
+    })
+    _list_cache[cache_key] = body
+    return Response(content=body, media_type="application/json")
 
 
 @app.post("/todos", response_model=TodoItem)
-def create_todo(todo: TodoCreate, username: Annotated[str, Depends(verify_credentials)]):
+async def create_todo(todo: TodoCreate, username: Annotated[str, Depends(verify_credentials)]):
     """Cria uma nova tarefa (requer autenticação)"""
+    global _next_id
     todos = read_data()
-    next_id = TodoItem.get_next_id()
 
-    new_todo = TodoItem(
-        id=next_id, 
+    new_todo = TodoRow(
+        id=_next_id,
         title=todo.title, 
         description=todo.description, 
         done=todo.done
     )
+    _next_id += 1
     todos.append(new_todo)
     write_data(todos)
     return new_todo
 
 
 @app.put("/todos/{todo_id}", response_model=TodoItem)
-def update_todo(todo_id: int, updated_todo: TodoCreate, username: Annotated[str, Depends(verify_credentials)]):
+async def update_todo(todo_id: int, updated_todo: TodoCreate, username: Annotated[str, Depends(verify_credentials)]):
     """Atualiza uma tarefa existente (requer autenticação)"""
     todos = read_data()
 
-    for i, todo in enumerate(todos):
-        if todo.id == todo_id:
-            # Cria um novo objeto TodoItem com os dados atualizados
-            updated = TodoItem(
-                id=todo_id,
-                title=updated_todo.title,
-                description=updated_todo.description,
-                done=updated_todo.done
-            )
-            todos[i] = updated
-            write_data(todos)
-            return updated
+    i = _ID_INDEX.get(todo_id)
+    if i is None:
+        raise HTTPException(status_code=404, detail=TASK_NOT_FOUND_MSG)
 
-    raise HTTPException(status_code=404, detail=TASK_NOT_FOUND_MSG)
+    # Cria um novo objeto TodoRow com os dados atualizados
+    updated = TodoRow(
+        id=todo_id,
+        title=updated_todo.title,
+        description=updated_todo.description,
+        done=updated_todo.done
+    )
+    todos[i] = updated
+    write_data(todos)
+    return updated
 
 
 @app.delete("/todos/{todo_id}")
-def delete_todo(todo_id: int, username: Annotated[str, Depends(verify_credentials)]):
+async def delete_todo(todo_id: int, username: Annotated[str, Depends(verify_credentials)]):
     """Remove uma tarefa (requer autenticação)"""
     todos = read_data()
-    initial_count = len(todos)
-    
-    todos = [todo for todo in todos if todo.id != todo_id]
 
-    if len(todos) == initial_count:
-        raise HTTPException(status_code=404, detail=TASK_NOT_FOUND_MSG)
+    with _LOCK:
+        i = _ID_INDEX.pop(todo_id, None)
+        if i is None:
+            raise HTTPException(status_code=404, detail=TASK_NOT_FOUND_MSG)
+
+        # Swap-remove O(1): o último elemento ocupa a posição removida,
+        # sem realocar a lista nem reconstruir o índice inteiro
+        last = todos.pop()
+        if i != len(todos):
+            todos[i] = last
+            _ID_INDEX[last.id] = i
+        _done_ids.discard(todo_id)
+        _pending_ids.discard(todo_id)
+        _mark_dirty()
 
-    write_data(todos)
     return {"message": "Tarefa removida com sucesso."}
 
 
 @app.get("/todos/{todo_id}", response_model=TodoItem)
-def get_todo(todo_id: int, username: Annotated[str, Depends(verify_credentials)]):
+async def get_todo(todo_id: int, username: Annotated[str, Depends(verify_credentials)]):
     """Obtém uma tarefa específica (requer autenticação)"""
     todos = read_data()
-    
-    for todo in todos:
-        if todo.id == todo_id:
-            return todo
-    
-    raise HTTPException(status_code=404, detail=TASK_NOT_FOUND_MSG)
+
+    i = _ID_INDEX.get(todo_id)
+    if i is None:
+        raise HTTPException(status_code=404, detail=TASK_NOT_FOUND_MSG)
+
+    return todos[i]
 
 
 @app.patch("/todos/{todo_id}/toggle", response_model=TodoItem)
-def toggle_todo_status(todo_id: int, username: Annotated[str, Depends(verify_credentials)]):
+async def toggle_todo_status(todo_id: int, username: Annotated[str, Depends(verify_credentials)]):
     """Alterna o status de conclusão de uma tarefa (requer autenticação)"""
     todos = read_data()
-    
-    for i, todo in enumerate(todos):
-        if todo.id == todo_id:
-            # Cria um novo objeto com o status invertido
-            updated = TodoItem(
-                id=todo.id,
-                title=todo.title,
-                description=todo.description,
-                done=not todo.done
-            )
-            todos[i] = updated
-            write_data(todos)
-            return updated
-    
-    raise HTTPException(status_code=404, detail=TASK_NOT_FOUND_MSG)
+
+    i = _ID_INDEX.get(todo_id)
+    if i is None:
+        raise HTTPException(status_code=404, detail=TASK_NOT_FOUND_MSG)
+
+    todo = todos[i]
+    # Cria um novo objeto com o status invertido
+    updated = TodoRow(
+        id=todo.id,
+        title=todo.title,
+        description=todo.description,
+        done=not todo.done
+    )
+    todos[i] = updated
+    write_data(todos)
+    return updated
 
 
 @app.get("/todos/status/{status}")
-def get_todos_by_status(status: str, username: Annotated[str, Depends(verify_credentials)]):
+async def get_todos_by_status(status: str, username: Annotated[str, Depends(verify_credentials)]):
     """Obtém tarefas filtradas por status (completed/pending) - requer autenticação"""
-    if status not in ["completed", "pending"]:
+    if status not in _VALID_STATUS:
         raise HTTPException(status_code=400, detail="Status deve ser 'completed' ou 'pending'")
     
     todos = read_data()
-    is_done = status == "completed"
-    filtered_todos = [todo for todo in todos if todo.done == is_done]
-    
-    return {
+    # O(k) no tamanho do resultado: usa o conjunto de ids do status
+    # pedido em vez de varrer a lista inteira
+    status_ids = _done_ids if status == "completed" else _pending_ids
+    filtered_todos = [todos[_ID_INDEX[todo_id]] for todo_id in sorted(status_ids)]
+
+    return ORJSONResponse({
         "status": status,
         "count": len(filtered_todos),
         "todos": filtered_todos
-    }
+    })